@@ -37,6 +37,9 @@
 #
 # ***** END LICENSE BLOCK *****
 
+import io
+import mmap
+import os
 
 from pyffi.formats.egm import EgmFormat
 from io_scene_nif.utility.nif_logging import NifLog
@@ -48,17 +51,24 @@ class EGMFile():
     @staticmethod
     def load_egm(file_path):
         """Loads an egm file from the given path"""
-        NifLog.info("Loading {0}".format(file_path))
+        NifLog.info("Loading %s", file_path)
         
         egm_file = EgmFormat.Data()
         
-        # open keyframe file for binary reading
-        with open(file_path, "rb") as egm_stream:
+        # memory map the egm file, pyffi does many small reads while parsing
+        # (empty files cannot be mapped, these are left to fail the version check)
+        with open(file_path, "rb") as egm_file_stream:
+            if os.fstat(egm_file_stream.fileno()).st_size:
+                egm_stream = mmap.mmap(egm_file_stream.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                egm_stream = io.BytesIO()
+        
+        with egm_stream:
             # check if nif file is valid
             egm_file.inspect_quick(egm_stream)
             if egm_file.version >= 0:
                 # it is valid, so read the file
-                NifLog.info("EGM file version: {0}".format(egm_file.version, "x"))
+                NifLog.info("EGM file version: %s", egm_file.version)
                 NifLog.info("Reading FaceGen egm file")
                 egm_file.read(egm_stream)
             elif egm_file.version == -1:
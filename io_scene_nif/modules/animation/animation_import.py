@@ -566,7 +566,7 @@ class ArmatureAnimation():
         Loads an animation attached to a nif block (non-skeletal).
         Becomes the object level animation of the blender object.
         """
-        NifLog.debug('Importing animation for object %s'.format(b_obj.name))
+        NifLog.debug('Importing animation for object %s', b_obj.name)
         
         kfc = nif_utils.find_controller(n_block, NifFormat.NiKeyframeController)
         if kfc:
@@ -578,7 +578,7 @@ class ArmatureAnimation():
         Loads an animation attached to a nif block (skeletal).
         Becomes the pose bone level animation of the blender object.
         """
-        NifLog.debug('Importing animation for bone %s'.format(bone_name))
+        NifLog.debug('Importing animation for bone %s', bone_name)
         
         kfc = nif_utils.find_controller(n_block, NifFormat.NiKeyframeController)
         if kfc:
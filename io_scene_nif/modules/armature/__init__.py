@@ -142,7 +142,8 @@ def get_bind_matrix(bone):
     return bind
 
 def nif_bind_to_blender_bind(nif_armature_space_matrix):
-    return correction_inv * correction * nif_armature_space_matrix * correction_inv
+    # correction_inv * correction, the leading product of the basis change, is the identity
+    return nif_armature_space_matrix * correction_inv
     
 def get_armature():
     """
@@ -38,6 +38,7 @@
 # ***** END LICENSE BLOCK *****
 
 import os
+from collections import deque
 
 import bpy
 import mathutils
@@ -52,17 +53,40 @@ from io_scene_nif.utility.nif_global import NifOp
 def create_b_obj(ob_name, b_obj_data):
     """Helper function to create a b_obj from b_obj_data, link it to the current scene, make it active and select it."""
     b_obj = bpy.data.objects.new(ob_name, b_obj_data)
-    bpy.context.scene.objects.link(b_obj)
-    bpy.context.scene.objects.active = b_obj
+    # look up the scene's objects only once, every bpy.context access goes through RNA
+    scene_objects = bpy.context.scene.objects
+    scene_objects.link(b_obj)
+    scene_objects.active = b_obj
     b_obj.select = True
     return b_obj
 
+# block type -> whether blocks of that type can be bones, filled on demand
+_bone_types = {}
+
+def can_be_bone(block_type):
+    """Helper function to test if blocks of a type can be bones, caching the result per type."""
+    try:
+        return _bone_types[block_type]
+    except KeyError:
+        result = _bone_types[block_type] = (issubclass(block_type, NifFormat.NiNode)
+                                            and not issubclass(block_type, NifFormat.NiLODNode))
+        return result
+
 class Armature():
     
     def __init__(self, parent):
         self.nif_import = parent
         # this is used to hold lists of bones for each armature during mark_armatures_bones
         self.dict_armatures = {}
+        # ids of the bones in each dict_armatures list, for fast membership tests
+        self._armature_sets = {}
+        # ids of all blocks marked as bones in any armature, for fast is_bone lookups
+        self._bone_set = set()
+        # per-import caches keyed by block id, cleared after each armature import
+        self._grouping_cache = {}
+        self._matrix_cache = {}
+        # skeleton roots whose bone trees are populated after mark_armatures_bones walked the tree
+        self._pending_populate = set()
         
     def import_armature(self, n_armature):
         """Scans an armature hierarchy, and returns a whole armature.
@@ -77,8 +101,18 @@ class Armature():
         
         # make armature editable and create bones
         bpy.ops.object.mode_set(mode='EDIT',toggle=False)
-        for n_child in n_armature.children:
-            self.import_bone(n_child, b_armature_data, n_armature)
+        bone_order = self._collect_bone_order(n_armature)
+        b_edit_bones = {}
+        for n_block, n_parent in bone_order:
+            # get the nif bone's armature space matrix
+            # (under the hood all bone space matrixes are multiplied together)
+            # and transform it to blender's coordinate space
+            b_bind = armature.nif_bind_to_blender_bind(self.import_bone_matrix(n_block, n_parent, n_armature))
+            b_edit_bone = self.import_bone(n_block, b_armature_data, b_bind)
+            # link to parent, which is always created before its children
+            if n_parent is not None:
+                b_edit_bone.parent = b_edit_bones[id(n_parent)]
+            b_edit_bones[id(n_block)] = b_edit_bone
         self.fix_bone_lengths(b_armature_data)
         bpy.ops.object.mode_set(mode='OBJECT',toggle=False)
 
@@ -91,46 +125,66 @@ class Armature():
                     n_block = self.nif_import.dict_blocks[bone_name]
                     self.nif_import.animationhelper.armature_animation.import_bone_animation(n_block, b_armature_obj, bone_name)
                 else:
-                    NifLog.info("'%s' can not be found in the NIF - unable to import animation. This likely means your NIF structure duplicated bones".format(bone_name))
+                    NifLog.info("'%s' can not be found in the NIF - unable to import animation. This likely means your NIF structure duplicated bones", bone_name)
+        self._grouping_cache.clear()
+        self._matrix_cache.clear()
         return b_armature_obj
         
-    def import_bone(self, n_block, b_armature_data, n_armature, b_parent_bone=None):
-        """Adds a bone to the armature in edit mode."""
-        # check that n_block is indeed a bone
-        if not self.is_bone(n_block):
-            return None
+    def _collect_bone_order(self, n_armature):
+        """Returns a list of (bone, parent bone) tuples for all bones under
+        n_armature, parents always preceding their children. The parent is
+        None for bones directly under the armature."""
+        bone_order = []
+        stack = [(n_child, None) for n_child in reversed(n_armature.children)]
+        while stack:
+            n_block, n_parent = stack.pop()
+            # bones are only searched for below other bones
+            if not self.is_bone(n_block):
+                continue
+            bone_order.append((n_block, n_parent))
+            stack.extend((n_child, n_block) for n_child in reversed(n_block.children))
+        return bone_order
+
+    def import_bone_matrix(self, n_block, n_parent, n_armature):
+        """Get a bone's armature space matrix. The parent bone's matrix must have
+        been imported before, so every bone only adds its own transform."""
+        n_bind = self._matrix_cache.get(id(n_block))
+        if n_bind is None:
+            if n_parent is None:
+                n_bind = nif_utils.import_matrix(n_block, relative_to=n_armature)
+            else:
+                n_bind = self._matrix_cache[id(n_parent)] * nif_utils.import_matrix(n_block)
+            self._matrix_cache[id(n_block)] = n_bind
+        return n_bind
+
+    def import_bone(self, n_block, b_armature_data, b_bind):
+        """Adds a bone to the armature in edit mode, from its armature space matrix in blender's coordinate space."""
         # bone name
         bone_name = self.nif_import.import_name(n_block)
         # create a new bone
         b_edit_bone = b_armature_data.edit_bones.new(bone_name)
-        # get the nif bone's armature space matrix
-        # (under the hood all bone space matrixes are multiplied together)
-        n_bind = nif_utils.import_matrix(n_block, relative_to=n_armature)
-        # get transformation in blender's coordinate space
-        b_bind = armature.nif_bind_to_blender_bind(n_bind)
         # the following is a workaround because blender can no longer set matrices to bones directly
         tail, roll = nif_utils.mat3_to_vec_roll(b_bind.to_3x3())
         b_edit_bone.head = b_bind.to_translation()
         b_edit_bone.tail = tail + b_edit_bone.head
         b_edit_bone.roll = roll
-        # link to parent
-        if b_parent_bone:
-            b_edit_bone.parent = b_parent_bone
-        # import and parent bone children
-        for n_child in n_block.children:
-            self.import_bone(n_child, b_armature_data, n_armature, b_edit_bone)
+        return b_edit_bone
 
     def fix_bone_lengths(self, b_armature_data):
         """Sets all edit_bones to a suitable length."""
+        # gather all children's heads in a single pass,
+        # EditBone.children has to scan all edit_bones on every access
+        child_heads = {}
+        for b_edit_bone in b_armature_data.edit_bones:
+            if b_edit_bone.parent:
+                child_heads.setdefault(b_edit_bone.parent.name, []).append(b_edit_bone.head)
         for b_edit_bone in b_armature_data.edit_bones:
             #don't change root bones
             if b_edit_bone.parent:
                 # take the desired length from the mean of all children's heads
-                if b_edit_bone.children:
-                    childheads = mathutils.Vector()
-                    for b_child in b_edit_bone.children:
-                        childheads += b_child.head
-                    bone_length = (b_edit_bone.head - childheads/len(b_edit_bone.children)).length
+                heads = child_heads.get(b_edit_bone.name)
+                if heads:
+                    bone_length = (b_edit_bone.head - sum(heads, mathutils.Vector())/len(heads)).length
                     if bone_length < 0.01:
                         bone_length = 0.25
                 # end of a chain
@@ -167,9 +221,8 @@ class Armature():
                     skelroot = niBlock
             else:
                 skelroot = niBlock
-            if skelroot not in self.dict_armatures:
-                self.dict_armatures[skelroot] = []
-            NifLog.info("Selecting node '%s' as skeleton root".format(skelroot.name))
+            self._add_armature(skelroot)
+            NifLog.info("Selecting node '%s' as skeleton root", skelroot.name)
             # add bones
             self.populate_bone_tree(skelroot)
             return # done!
@@ -177,107 +230,147 @@ class Armature():
         # attaching to selected armature -> first identify armature and bones
         elif NifOp.props.skeleton == "GEOMETRY_ONLY" and not self.dict_armatures:
             b_armature_obj = self.nif_import.selected_objects[0]
-            skelroot = niBlock.find(block_name=b_armature_obj.name)
+            # index the names once rather than searching the tree for every bone
+            name_index = self.index_block_names(niBlock)
+            skelroot = name_index.get(b_armature_obj.name)
             if not skelroot:
                 raise nif_utils.NifError("nif has no armature '%s'" % b_armature_obj.name)
-            NifLog.debug("Identified '{0}' as armature".format(skelroot.name))
-            self.dict_armatures[skelroot] = []
+            NifLog.debug("Identified '%s' as armature", skelroot.name)
+            self._add_armature(skelroot)
+            if skelroot is not niBlock:
+                name_index = self.index_block_names(skelroot)
             for bone_name in b_armature_obj.data.bones.keys():
                 # blender bone naming -> nif bone naming
                 nif_bone_name = armature.get_bone_name_for_nif(bone_name)
                 # find a block with bone name
-                bone_block = skelroot.find(block_name=nif_bone_name)
+                bone_block = name_index.get(nif_bone_name)
                 # add it to the name list if there is a bone with that name
                 if bone_block:
-                    NifLog.info("Identified nif block '{0}' with bone '{1}' in selected armature".format(nif_bone_name, bone_name))
+                    NifLog.info("Identified nif block '%s' with bone '%s' in selected armature", nif_bone_name, bone_name)
                     self.nif_import.dict_names[bone_block] = bone_name
-                    self.dict_armatures[skelroot].append(bone_block)
+                    self._add_bone(skelroot, bone_block)
                     self.complete_bone_tree(bone_block, skelroot)
 
+        # walk the tree, collecting the skeleton roots whose bone trees
+        # still have to be populated
+        stack = deque([niBlock])
+        while stack:
+            n_block = stack.pop()
+            self._process_node(n_block)
+            # only nodes can hold skinned geometry further down the tree,
+            # so skip the branches of any other blocks (lights, cameras, ...)
+            if not isinstance(n_block, NifFormat.NiNode):
+                continue
+            # continue down the tree, keeping the children in order
+            stack.extend(reversed([child for child in n_block.get_refs()
+                                   if isinstance(child, (NifFormat.NiNode, NifFormat.NiTriBasedGeom))]))
+
+        for skelroot in self._pending_populate:
+            self.populate_bone_tree(skelroot)
+        self._pending_populate.clear()
+
+    def _process_node(self, niBlock):
+        """Mark the armature and bones of a single block's skin instance, if any."""
         # search for all NiTriShape or NiTriStrips blocks...
         if isinstance(niBlock, NifFormat.NiTriBasedGeom):
             # yes, we found one, get its skin instance
             if niBlock.is_skin():
-                NifLog.debug("Skin found on block '{0}'".format(niBlock.name))
+                NifLog.debug("Skin found on block '%s'", niBlock.name)
                 # it has a skin instance, so get the skeleton root
                 # which is an armature only if it's not a skinning influence
                 # so mark the node to be imported as an armature
                 skininst = niBlock.skin_instance
                 skelroot = skininst.skeleton_root
                 if NifOp.props.skeleton == "EVERYTHING":
-                    if skelroot not in self.dict_armatures:
-                        self.dict_armatures[skelroot] = []
-                        NifLog.debug("'{0}' is an armature".format(skelroot.name))
+                    if self._add_armature(skelroot):
+                        NifLog.debug("'%s' is an armature", skelroot.name)
                 elif NifOp.props.skeleton == "GEOMETRY_ONLY":
                     if skelroot not in self.dict_armatures:
                         raise nif_utils.NifError(
                             "nif structure incompatible with '%s' as armature:"
                             " node '%s' has '%s' as armature"
-                            % (b_armature_obj.name, niBlock.name, skelroot.name))
+                            % (self.nif_import.selected_objects[0].name, niBlock.name, skelroot.name))
 
                 for boneBlock in skininst.bones:
                     # boneBlock can be None; see pyffi issue #3114079
                     if not boneBlock:
                         continue
-                    if boneBlock not in self.dict_armatures[skelroot]:
-                        self.dict_armatures[skelroot].append(boneBlock)
-                        NifLog.debug("'{0}' is a bone of armature '{1}'".format(boneBlock.name, skelroot.name))
+                    if id(boneBlock) not in self._armature_sets[skelroot]:
+                        self._add_bone(skelroot, boneBlock)
+                        NifLog.debug("'%s' is a bone of armature '%s'", boneBlock.name, skelroot.name)
                     # now we "attach" the bone to the armature:
                     # we make sure all NiNodes from this bone all the way
                     # down to the armature NiNode are marked as bones
                     self.complete_bone_tree(boneBlock, skelroot)
 
-                # mark all nodes as bones
-                self.populate_bone_tree(skelroot)
-        # continue down the tree
-        for child in niBlock.get_refs():
-            if not isinstance(child, NifFormat.NiAVObject): continue # skip blocks that don't have transforms
-            self.mark_armatures_bones(child)
+                # mark all nodes as bones, once the whole tree is walked
+                self._pending_populate.add(skelroot)
         
+    def index_block_names(self, root):
+        """Map the names of all blocks in root's tree to the block, the first
+        block found wins as for find."""
+        name_index = {}
+        for n_block in root.tree():
+            if isinstance(n_block, NifFormat.NiObjectNET):
+                name_index.setdefault(self.nif_import.decoded_name(n_block), n_block)
+        return name_index
+
     def populate_bone_tree(self, skelroot):
         """Add all of skelroot's bones to its dict_armatures list.
         """
         for bone in skelroot.tree():
             if bone is skelroot:
                 continue
-            if not isinstance(bone, NifFormat.NiNode):
+            # only NiNodes can be bones, but LOD nodes are never bones
+            if not can_be_bone(type(bone)):
                 continue
-            if isinstance(bone, NifFormat.NiLODNode):
-                # LOD nodes are never bones
+            if self.is_grouping_node(bone):
                 continue
-            if self.nif_import.is_grouping_node(bone):
-                continue
-            if bone not in self.dict_armatures[skelroot]:
-                self.dict_armatures[skelroot].append(bone)
-                NifLog.debug("'{0}' marked as extra bone of armature '{1}'".format(bone.name, skelroot.name))
+            if id(bone) not in self._armature_sets[skelroot]:
+                self._add_bone(skelroot, bone)
+                NifLog.debug("'%s' marked as extra bone of armature '%s'", bone.name, skelroot.name)
         
     def complete_bone_tree(self, bone, skelroot):
         """Make sure that the complete hierarchy from skelroot down to bone is marked in dict_armatures.
+        The bone itself must already be marked as a bone of skelroot.
         """
-        # we must already have marked this one as a bone
-        assert skelroot in self.dict_armatures # debug
-        assert bone in self.dict_armatures[skelroot] # debug
-        # get the node parent, this should be marked as an armature or as a bone
+        # walk up the parents, each should be marked as an armature or as a bone
         boneparent = bone._parent
-        if boneparent != skelroot:
+        while boneparent is not skelroot and boneparent is not None:
             # parent is not the skeleton root
-            if boneparent not in self.dict_armatures[skelroot]:
+            if id(boneparent) not in self._armature_sets[skelroot]:
                 # neither is it marked as a bone: so mark the parent as a bone
-                self.dict_armatures[skelroot].append(boneparent)
+                self._add_bone(skelroot, boneparent)
                 # store the coordinates for realignement autodetection 
-                NifLog.debug("'{0}' is a bone of armature '{1}'".format(boneparent.name, skelroot.name))
-            # now the parent is marked as a bone
-            # recursion: complete the bone tree,
-            # this time starting from the parent bone
-            self.complete_bone_tree(boneparent, skelroot)
+                NifLog.debug("'%s' is a bone of armature '%s'", boneparent.name, skelroot.name)
+            # now the parent is marked as a bone,
+            # continue from its own parent
+            boneparent = boneparent._parent
+
+    def _add_armature(self, skelroot):
+        """Mark skelroot as an armature, returns True if it was not marked before."""
+        bones = []
+        if self.dict_armatures.setdefault(skelroot, bones) is bones:
+            self._armature_sets[skelroot] = set()
+            return True
+        return False
+
+    def _add_bone(self, skelroot, bone):
+        """Mark bone as part of skelroot's armature."""
+        self.dict_armatures[skelroot].append(bone)
+        self._armature_sets[skelroot].add(id(bone))
+        self._bone_set.add(id(bone))
 
     def is_bone(self, niBlock):
         """Tests a NiNode to see if it's a bone."""
-        if not niBlock :
-            return False
-        for bones in self.dict_armatures.values():
-            if niBlock in bones:
-                return True
+        return niBlock is not None and id(niBlock) in self._bone_set
+
+    def is_grouping_node(self, niBlock):
+        """Cached test whether a NiNode is a grouping node."""
+        is_grouping = self._grouping_cache.get(id(niBlock))
+        if is_grouping is None:
+            is_grouping = self._grouping_cache[id(niBlock)] = bool(self.nif_import.is_grouping_node(niBlock))
+        return is_grouping
 
     def is_armature_root(self, niBlock):
         """Tests a block to see if it's an armature."""
@@ -296,10 +389,13 @@ class Armature():
         except KeyError:
             namestxt = bpy.data.texts.new("FullNames")
             
-        # write the names to the text buffer
+        # write the names to the text buffer, all in one go
+        lines = []
         for block, shortname in self.nif_import.dict_names.items():
-            block_name = block.name.decode()
+            block_name = self.nif_import.decoded_name(block)
             if block_name and shortname != block_name:
-                namestxt.write('%s;%s\n' % (shortname, block_name))
+                lines.append('%s;%s\n' % (shortname, block_name))
+        if lines:
+            namestxt.write(''.join(lines))
                 
                 
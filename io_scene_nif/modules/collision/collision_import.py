@@ -37,11 +37,13 @@
 #
 # ***** END LICENSE BLOCK *****
 
+import math
+
 import bpy
 import mathutils
 
-from functools import reduce
-import operator
+from bisect import bisect_right
+from itertools import accumulate, chain
 
 from pyffi.formats.nif import NifFormat
 from pyffi.utils.quickhull import qhull3d
@@ -49,16 +51,117 @@ from io_scene_nif.modules.object.object_import import NiObject
 from io_scene_nif.utility.nif_logging import NifLog
 from io_scene_nif.utility.nif_global import NifOp
 
+# scipy's compiled qhull is used for convex hulls when it is installed
+try:
+    from scipy.spatial import ConvexHull
+except ImportError:
+    ConvexHull = None
+
+# enum names, looked up once rather than through pyffi for every shape
+_HAVOK_MAT = tuple(NifFormat.HavokMaterial._enumkeys)
+_DEACT = tuple(NifFormat.DeactivatorType._enumkeys)
+_OBLIV = tuple(NifFormat.OblivionLayer._enumkeys)
+_QUAL = tuple(NifFormat.MotionQuality._enumkeys)
+_MOTION = tuple(NifFormat.MotionSystem._enumkeys)
+_SOLVDEACT = tuple(NifFormat.SolverDeactivation._enumkeys)
+
+
+def _group_props(props):
+    """Groups a dict of (dotted) attribute paths to values by the attribute
+    that owns them, None for the object itself, so that each owner only
+    has to be looked up once when the properties are applied."""
+    grouped_props = {}
+    for path, value in props.items():
+        owner_attr, _, attr = path.rpartition('.')
+        grouped_props.setdefault(owner_attr or None, {})[attr] = value
+    return grouped_props
+
+def _apply_props(b_obj, grouped_props):
+    """Sets the properties of b_obj, grouped by owner as by _group_props."""
+    for owner_attr, props in grouped_props.items():
+        target = b_obj if owner_attr is None else getattr(b_obj, owner_attr)
+        for attr, value in props.items():
+            setattr(target, attr, value)
+
+# display and game engine bounds settings of the collision objects, per shape type
+_BOX_PROPS = _group_props({
+    'draw_type': 'WIRE',
+    'draw_bounds_type': 'BOX',
+    'game.use_collision_bounds': True,
+    'game.collision_bounds_type': 'BOX'})
+_SPHERE_PROPS = _group_props({
+    'draw_type': 'WIRE',
+    'draw_bounds_type': 'SPHERE',
+    'game.use_collision_bounds': True,
+    'game.collision_bounds_type': 'SPHERE'})
+_CAPSULE_PROPS = _group_props({
+    'draw_type': 'BOUNDS',
+    'draw_bounds_type': 'CAPSULE',
+    'game.use_collision_bounds': True,
+    'game.collision_bounds_type': 'CAPSULE'})
+_CONVEX_PROPS = _group_props({
+    'show_wire': True,
+    'draw_type': 'WIRE',
+    'draw_bounds_type': 'BOX',
+    'game.use_collision_bounds': True,
+    'game.collision_bounds_type': 'CONVEX_HULL'})
+_TRIANGLE_MESH_PROPS = _group_props({
+    'draw_type': 'WIRE',
+    'draw_bounds_type': 'BOX',
+    'game.use_collision_bounds': True,
+    'game.collision_bounds_type': 'TRIANGLE_MESH'})
+_BOUNDING_BOX_PROPS = _group_props({
+    'show_bounds': True,
+    'draw_type': 'BOUNDS',
+    'draw_bounds_type': 'BOX',
+    'game.use_collision_bounds': True,
+    'game.collision_bounds_type': 'BOX'})
+
+
+# quads of a box whose corners are ordered as in box_from_extents
+_BOX_FACES = ((0,1,3,2),(6,7,5,4),(0,2,6,4),(3,1,5,7),(4,5,1,0),(7,6,2,3))
 
 def box_from_extents(b_name, minx, maxx, miny, maxy, minz, maxz):
-    verts = []
-    for x in [minx, maxx]:
-        for y in [miny, maxy]:
-            for z in [minz, maxz]:
-                verts.append( (x,y,z) )
-    faces = [[0,1,3,2],[6,7,5,4],[0,2,6,4],[3,1,5,7],[4,5,1,0],[7,6,2,3]]
-    return mesh_from_data(b_name, verts, faces)
+    verts = [ (x,y,z) for x in (minx, maxx) for y in (miny, maxy) for z in (minz, maxz) ]
+    return mesh_from_data(b_name, verts, _BOX_FACES)
     
+def convex_hull(points):
+    """Returns the vertices and triangles of the convex hull of points. Uses
+    scipy's qhull if available, otherwise (or if qhull fails on degenerate
+    input) the pure python quickhull of pyffi."""
+    if ConvexHull is None:
+        return qhull3d(points)
+    try:
+        hull = ConvexHull(points)
+    except (RuntimeError, ValueError):
+        return qhull3d(points)
+    # only keep the points on the hull
+    vert_indices = {}
+    verts = []
+    for point_index in hull.vertices:
+        vert_indices[point_index] = len(verts)
+        verts.append(tuple(points[point_index]))
+    faces = []
+    for simplex, equation in zip(hull.simplices, hull.equations):
+        # qhull does not orient its triangles, flip those not facing outwards
+        v_1, v_2, v_3 = (mathutils.Vector(points[point_index]) for point_index in simplex)
+        if (v_2 - v_1).cross(v_3 - v_1).dot(equation[:3]) < 0:
+            simplex = reversed(simplex)
+        faces.append(tuple(vert_indices[point_index] for point_index in simplex))
+    return verts, faces
+
+def matrix_from_quat_trans(w, x, y, z, tx, ty, tz):
+    """Returns the 4x4 matrix of the rotation quaternion (w, x, y, z) followed by
+    the translation (tx, ty, tz), the same as Quaternion.to_matrix().to_4x4()
+    with its translation set, but built in one go."""
+    xx, yy, zz = 2 * x * x, 2 * y * y, 2 * z * z
+    xy, xz, yz = 2 * x * y, 2 * x * z, 2 * y * z
+    wx, wy, wz = 2 * w * x, 2 * w * y, 2 * w * z
+    return mathutils.Matrix(((1 - yy - zz, xy - wz, xz + wy, tx),
+                             (xy + wz, 1 - xx - zz, yz - wx, ty),
+                             (xz - wy, yz + wx, 1 - xx - yy, tz),
+                             (0.0, 0.0, 0.0, 1.0)))
+
 def create_ob(ob_name, ob_data):
     ob = bpy.data.objects.new(ob_name, ob_data)
     bpy.context.scene.objects.link(ob)
@@ -67,8 +170,18 @@ def create_ob(ob_name, ob_data):
 
 def mesh_from_data(name, verts, faces, wireframe = True):
     me = bpy.data.meshes.new(name)
-    me.from_pydata(verts, [], faces)
-    me.update()
+    # fill the mesh in bulk, as from_pydata(verts, [], faces) does, but
+    # without its extra edges pass and with a single update at the end
+    loop_totals = [len(face) for face in faces]
+    me.vertices.add(len(verts))
+    me.loops.add(sum(loop_totals))
+    me.polygons.add(len(faces))
+    me.vertices.foreach_set("co", tuple(chain.from_iterable(verts)))
+    me.loops.foreach_set("vertex_index", tuple(chain.from_iterable(faces)))
+    me.polygons.foreach_set("loop_start", [loop_end - loop_total for loop_end, loop_total
+                                           in zip(accumulate(loop_totals), loop_totals)])
+    me.polygons.foreach_set("loop_total", loop_totals)
+    me.update(calc_edges=True)
     ob = create_ob(name, me)
     if wireframe:
         ob.draw_type = 'WIRE'
@@ -80,6 +193,28 @@ class bhkshape_import():
     def __init__(self, parent):
         self.nif_import = parent
         self.HAVOK_SCALE = parent.HAVOK_SCALE
+        # shape type -> import method, for import_bhk_shape
+        self.shape_importers = {
+            NifFormat.bhkTransformShape: self.import_bhktransform,
+            NifFormat.bhkRigidBody: self.import_bhkridgidbody,
+            NifFormat.bhkBoxShape: self.import_bhkbox_shape,
+            NifFormat.bhkSphereShape: self.import_bhksphere_shape,
+            NifFormat.bhkCapsuleShape: self.import_bhkcapsule_shape,
+            NifFormat.bhkConvexVerticesShape: self.import_bhkconvex_vertices_shape,
+            NifFormat.bhkPackedNiTriStripsShape: self.import_bhkpackednitristrips_shape,
+            NifFormat.bhkNiTriStripsShape: self.import_bhknitristrips_shape,
+            NifFormat.NiTriStripsData: self.import_nitristrips,
+            NifFormat.bhkMoppBvTreeShape: self.import_bhkmoppbvtree_shape,
+            NifFormat.bhkListShape: self.import_bhklist_shape,
+        }
+
+    def set_havok_scale(self, data):
+        """Sets the havok scale for the nif data that is imported, which does not
+        change for the rest of the import."""
+        if data._user_version_value_._value == 12 and data._user_version_2_value_._value == 83:
+            self.HAVOK_SCALE = self.nif_import.HAVOK_SCALE * 10
+        else:
+            self.HAVOK_SCALE = self.nif_import.HAVOK_SCALE
 
     def get_havok_objects(self):
         return self.nif_import.dict_havok_objects
@@ -87,51 +222,42 @@ class bhkshape_import():
     def import_bhk_shape(self, bhkshape):
         """Imports any supported collision shape as list of blender meshes."""
 
-        if self.nif_import.data._user_version_value_._value == 12:
-            if self.nif_import.data._user_version_2_value_._value == 83:
-                self.HAVOK_SCALE = self.nif_import.HAVOK_SCALE * 10
-            else:
-                self.HAVOK_SCALE = self.nif_import.HAVOK_SCALE
-
-        if isinstance(bhkshape, NifFormat.bhkTransformShape):
-            return self.import_bhktransform(bhkshape)
-
-        elif isinstance(bhkshape, NifFormat.bhkRigidBody):
-            return self.import_bhkridgidbody(bhkshape)
-
-        elif isinstance(bhkshape, NifFormat.bhkBoxShape):
-            return self.import_bhkbox_shape(bhkshape)
-
-        elif isinstance(bhkshape, NifFormat.bhkSphereShape):
-            return self.import_bhksphere_shape(bhkshape)
-
-        elif isinstance(bhkshape, NifFormat.bhkCapsuleShape):
-            return self.import_bhkcapsule_shape(bhkshape)
-
-        elif isinstance(bhkshape, NifFormat.bhkConvexVerticesShape):
-            return self.import_bhkconvex_vertices_shape(bhkshape)
-
-        elif isinstance(bhkshape, NifFormat.bhkPackedNiTriStripsShape):
-            return self.import_bhkpackednitristrips_shape(bhkshape)
+        import_shape = self.get_shape_importer(type(bhkshape))
+        if import_shape:
+            return import_shape(bhkshape)
 
-        elif isinstance(bhkshape, NifFormat.bhkNiTriStripsShape):
-            self.havok_mat = bhkshape.material
-            return reduce(operator.add,
-                          (self.import_bhk_shape(strips)
-                           for strips in bhkshape.strips_data))
+        NifLog.warn("Unsupported bhk shape {0}".format(bhkshape.__class__.__name__))
+        return []
 
-        elif isinstance(bhkshape, NifFormat.NiTriStripsData):
-            return self.import_nitristrips(bhkshape)
+    def get_shape_importer(self, shape_type):
+        """Returns the import method for a shape type, or None if the type is not supported.
+        Subclasses of supported types are resolved once and then cached."""
+        try:
+            return self.shape_importers[shape_type]
+        except KeyError:
+            for base_type in shape_type.__mro__:
+                if base_type in self.shape_importers:
+                    import_shape = self.shape_importers[base_type]
+                    break
+            else:
+                import_shape = None
+            self.shape_importers[shape_type] = import_shape
+            return import_shape
 
-        elif isinstance(bhkshape, NifFormat.bhkMoppBvTreeShape):
-            return self.import_bhk_shape(bhkshape.shape)
+    def import_bhknitristrips_shape(self, bhkshape):
+        """Imports all strips of a bhkNiTriStripsShape block."""
+        self.havok_mat = bhkshape.material
+        return list(chain.from_iterable(self.import_bhk_shape(strips)
+                                        for strips in bhkshape.strips_data))
 
-        elif isinstance(bhkshape, NifFormat.bhkListShape):
-            return reduce(operator.add, ( self.import_bhk_shape(subshape)
-                                          for subshape in bhkshape.sub_shapes ))
+    def import_bhkmoppbvtree_shape(self, bhkshape):
+        """Imports the shape of a bhkMoppBvTreeShape block."""
+        return self.import_bhk_shape(bhkshape.shape)
 
-        NifLog.warn("Unsupported bhk shape {0}".format(bhkshape.__class__.__name__))
-        return []
+    def import_bhklist_shape(self, bhkshape):
+        """Imports all sub shapes of a bhkListShape block."""
+        return list(chain.from_iterable(self.import_bhk_shape(subshape)
+                                        for subshape in bhkshape.sub_shapes))
 
 
     def import_bhktransform(self, bhkshape):
@@ -139,11 +265,14 @@ class bhkshape_import():
 
         # import shapes
         collision_objs = self.import_bhk_shape(bhkshape.shape)
-        # find transformation matrix
-        transform = mathutils.Matrix(bhkshape.transform.as_list())
-
-        # fix scale
-        transform.translation = transform.translation * self.HAVOK_SCALE
+        # find transformation matrix, with the scale fixed on the translation
+        (m_11, m_12, m_13, m_14), (m_21, m_22, m_23, m_24), (m_31, m_32, m_33, m_34), row_4 = \
+            bhkshape.transform.as_list()
+        havok_scale = self.HAVOK_SCALE
+        transform = mathutils.Matrix(((m_11, m_12, m_13, m_14 * havok_scale),
+                                      (m_21, m_22, m_23, m_24 * havok_scale),
+                                      (m_31, m_32, m_33, m_34 * havok_scale),
+                                      row_4))
 
         # apply transform
         for b_col_obj in collision_objs:
@@ -161,46 +290,57 @@ class bhkshape_import():
 
         # find transformation matrix in case of the T version
         if isinstance(bhkshape, NifFormat.bhkRigidBodyT):
-            # set rotation
-            transform = mathutils.Quaternion([
-                bhkshape.rotation.w, bhkshape.rotation.x,
-                bhkshape.rotation.y, bhkshape.rotation.z]).to_matrix()
-            transform = transform.to_4x4()
-
-            # set translation
-            transform.translation = mathutils.Vector(
-                    (bhkshape.translation.x * self.HAVOK_SCALE,
-                     bhkshape.translation.y * self.HAVOK_SCALE,
-                     bhkshape.translation.z * self.HAVOK_SCALE))
+            # rotation from the quaternion and scaled translation, as a single matrix
+            n_rot = bhkshape.rotation
+            n_trans = bhkshape.translation
+            havok_scale = self.HAVOK_SCALE
+            transform = matrix_from_quat_trans(n_rot.w, n_rot.x, n_rot.y, n_rot.z,
+                                               n_trans.x * havok_scale,
+                                               n_trans.y * havok_scale,
+                                               n_trans.z * havok_scale)
 
             # apply transform
             for b_col_obj in collision_objs:
                 b_col_obj.matrix_local = b_col_obj.matrix_local * transform
 
+        # add rigid bodies to all collision objects with a single operator call,
+        # this works on the selection so it is restored afterwards
+        if collision_objs:
+            scn = bpy.context.scene
+            selected_objs = bpy.context.selected_objects
+            for b_obj in selected_objs:
+                b_obj.select = False
+            for b_col_obj in collision_objs:
+                b_col_obj.select = True
+            scn.objects.active = collision_objs[-1]
+            bpy.ops.rigidbody.objects_add(type='ACTIVE')
+            for b_col_obj in collision_objs:
+                b_col_obj.select = False
+            for b_obj in selected_objs:
+                b_obj.select = True
+
         # set physics flags and mass
+        # the mass is divided over all collision objects
+        col_obj_mass = bhkshape.mass / len(collision_objs) if collision_objs else 0.0
+        # deactivation velocities are the magnitudes of the shape's velocities
+        n_vel = bhkshape.linear_velocity
+        linear_velocity = math.sqrt(n_vel.w * n_vel.w + n_vel.x * n_vel.x + n_vel.y * n_vel.y + n_vel.z * n_vel.z)
+        n_vel = bhkshape.angular_velocity
+        angular_velocity = math.sqrt(n_vel.w * n_vel.w + n_vel.x * n_vel.x + n_vel.y * n_vel.y + n_vel.z * n_vel.z)
         for b_col_obj in collision_objs:
-            scn = bpy.context.scene
-            scn.objects.active = b_col_obj
-            bpy.ops.rigidbody.object_add(type='ACTIVE')
             b_col_obj.rigid_body.enabled = True
-            
-            if bhkshape.mass > 0.0001:
-                # for physics emulation
-                # (mass 0 results in issues with simulation)
-                b_col_obj.rigid_body.mass = bhkshape.mass / len(collision_objs)
-
 
-            b_col_obj.nifcollision.deactivator_type = NifFormat.DeactivatorType._enumkeys[bhkshape.deactivator_type]
-            b_col_obj.nifcollision.solver_deactivation = NifFormat.SolverDeactivation._enumkeys[bhkshape.solver_deactivation]
-            b_col_obj.nifcollision.oblivion_layer = NifFormat.OblivionLayer._enumkeys[bhkshape.layer]
-            b_col_obj.nifcollision.quality_type = NifFormat.MotionQuality._enumkeys[bhkshape.quality_type]
-            b_col_obj.nifcollision.motion_system = NifFormat.MotionSystem._enumkeys[bhkshape.motion_system]
+            b_col_obj.nifcollision.deactivator_type = _DEACT[bhkshape.deactivator_type]
+            b_col_obj.nifcollision.solver_deactivation = _SOLVDEACT[bhkshape.solver_deactivation]
+            b_col_obj.nifcollision.oblivion_layer = _OBLIV[bhkshape.layer]
+            b_col_obj.nifcollision.quality_type = _QUAL[bhkshape.quality_type]
+            b_col_obj.nifcollision.motion_system = _MOTION[bhkshape.motion_system]
             
             b_col_obj.niftools.bsxflags = self.nif_import.bsxflags
             b_col_obj.niftools.objectflags = self.nif_import.objectflags
             b_col_obj.niftools.upb = self.nif_import.upbflags
             
-            b_col_obj.rigid_body.mass = bhkshape.mass / len(collision_objs)
+            b_col_obj.rigid_body.mass = col_obj_mass
             
             b_col_obj.rigid_body.use_deactivation = True
             b_col_obj.rigid_body.friction = bhkshape.friction
@@ -208,16 +348,8 @@ class bhkshape_import():
             #b_col_obj.rigid_body. = bhkshape.
             b_col_obj.rigid_body.linear_damping = bhkshape.linear_damping
             b_col_obj.rigid_body.angular_damping = bhkshape.angular_damping
-            b_col_obj.rigid_body.deactivate_linear_velocity = mathutils.Vector([
-                                            bhkshape.linear_velocity.w,
-                                            bhkshape.linear_velocity.x, 
-                                            bhkshape.linear_velocity.y, 
-                                            bhkshape.linear_velocity.z]).magnitude
-            b_col_obj.rigid_body.deactivate_angular_velocity = mathutils.Vector([
-                                            bhkshape.angular_velocity.w,
-                                            bhkshape.angular_velocity.x, 
-                                            bhkshape.angular_velocity.y, 
-                                            bhkshape.angular_velocity.z]).magnitude
+            b_col_obj.rigid_body.deactivate_linear_velocity = linear_velocity
+            b_col_obj.rigid_body.deactivate_angular_velocity = angular_velocity
             
             b_col_obj.collision.permeability = bhkshape.penetration_depth
 
@@ -238,23 +370,22 @@ class bhkshape_import():
     def import_bhkbox_shape(self, bhkshape):
         """Import a BhkBox block as a simple Box collision object"""
         # create box
-        minx = -bhkshape.dimensions.x * self.HAVOK_SCALE
-        maxx = +bhkshape.dimensions.x * self.HAVOK_SCALE
-        miny = -bhkshape.dimensions.y * self.HAVOK_SCALE
-        maxy = +bhkshape.dimensions.y * self.HAVOK_SCALE
-        minz = -bhkshape.dimensions.z * self.HAVOK_SCALE
-        maxz = +bhkshape.dimensions.z * self.HAVOK_SCALE
+        havok_scale = self.HAVOK_SCALE
+        n_dims = bhkshape.dimensions
+        minx = -n_dims.x * havok_scale
+        maxx = +n_dims.x * havok_scale
+        miny = -n_dims.y * havok_scale
+        maxy = +n_dims.y * havok_scale
+        minz = -n_dims.z * havok_scale
+        maxz = +n_dims.z * havok_scale
 
         #create blender object
         b_obj = box_from_extents("box", minx, maxx, miny, maxy, minz, maxz)
 
         # set bounds type
-        b_obj.draw_type = 'WIRE'
-        b_obj.draw_bounds_type = 'BOX'
-        b_obj.game.use_collision_bounds = True
-        b_obj.game.collision_bounds_type = 'BOX'
+        _apply_props(b_obj, _BOX_PROPS)
         b_obj.game.radius = bhkshape.radius
-        b_obj.nifcollision.havok_material = NifFormat.HavokMaterial._enumkeys[bhkshape.material]
+        b_obj.nifcollision.havok_material = _HAVOK_MAT[bhkshape.material]
         
         return [ b_obj ]
 
@@ -267,12 +398,9 @@ class bhkshape_import():
         b_obj = box_from_extents("sphere", -b_radius, b_radius, -b_radius, b_radius, -b_radius, b_radius)
 
         # set bounds type
-        b_obj.draw_type = 'WIRE'
-        b_obj.draw_bounds_type = 'SPHERE'
-        b_obj.game.use_collision_bounds = True
-        b_obj.game.collision_bounds_type = 'SPHERE'
+        _apply_props(b_obj, _SPHERE_PROPS)
         b_obj.game.radius = bhkshape.radius
-        b_obj.nifcollision.havok_material = NifFormat.HavokMaterial._enumkeys[bhkshape.material]
+        b_obj.nifcollision.havok_material = _HAVOK_MAT[bhkshape.material]
 
         return [ b_obj ]
 
@@ -282,24 +410,22 @@ class bhkshape_import():
         b_radius = bhkshape.radius
         # create capsule mesh
         length = (bhkshape.first_point - bhkshape.second_point).norm()
-        minx = miny = -b_radius * self.HAVOK_SCALE
-        maxx = maxy = +b_radius * self.HAVOK_SCALE
-        minz = -(length + 2*b_radius) * (self.HAVOK_SCALE / 2)
-        maxz = +(length + 2*b_radius) * (self.HAVOK_SCALE / 2)
+        havok_scale = self.HAVOK_SCALE
+        minx = miny = -b_radius * havok_scale
+        maxx = maxy = +b_radius * havok_scale
+        minz = -(length + 2*b_radius) * (havok_scale / 2)
+        maxz = +(length + 2*b_radius) * (havok_scale / 2)
 
         #create blender object
         b_obj = box_from_extents("capsule", minx, maxx, miny, maxy, minz, maxz)
 
         # set bounds type
-        b_obj.draw_type = 'BOUNDS'
-        b_obj.draw_bounds_type = 'CAPSULE'
-        b_obj.game.use_collision_bounds = True
-        b_obj.game.collision_bounds_type = 'CAPSULE'
-        b_obj.game.radius = bhkshape.radius*self.HAVOK_SCALE
-        b_obj.nifcollision.havok_material = NifFormat.HavokMaterial._enumkeys[bhkshape.material]
+        _apply_props(b_obj, _CAPSULE_PROPS)
+        b_obj.game.radius = b_radius * havok_scale
+        b_obj.nifcollision.havok_material = _HAVOK_MAT[bhkshape.material]
         
         # center around middle; will acount for bone length once it is parented
-        b_obj.location.y = length / 2 * self.HAVOK_SCALE
+        b_obj.location.y = length / 2 * havok_scale
         return [ b_obj ]
 
 
@@ -307,22 +433,21 @@ class bhkshape_import():
         """Import a BhkConvexVertex block as a convex hull collision object"""
 
         # find vertices (and fix scale)
-        verts, faces = qhull3d(   [ (self.HAVOK_SCALE * n_vert.x,
-                                     self.HAVOK_SCALE * n_vert.y,
-                                     self.HAVOK_SCALE * n_vert.z)
-                                     for n_vert in bhkshape.vertices ])
+        havok_scale = self.HAVOK_SCALE
+        points = {}
+        for n_vert in bhkshape.vertices:
+            point = (n_vert.x * havok_scale, n_vert.y * havok_scale, n_vert.z * havok_scale)
+            # merge (nearly) duplicate vertices, they only slow down the hull
+            points.setdefault(tuple(round(coord, 5) for coord in point), point)
+        verts, faces = convex_hull(list(points.values()))
 
         b_obj = mesh_from_data("convexpoly", verts, faces)
 
-        b_obj.show_wire = True
-        b_obj.draw_type = 'WIRE'
-        b_obj.draw_bounds_type = 'BOX'
-        b_obj.game.use_collision_bounds = True
-        b_obj.game.collision_bounds_type = 'CONVEX_HULL'
+        _apply_props(b_obj, _CONVEX_PROPS)
 
         # radius: quick estimate
         b_obj.game.radius = bhkshape.radius
-        b_obj.nifcollision.havok_material = NifFormat.HavokMaterial._enumkeys[bhkshape.material]
+        b_obj.nifcollision.havok_material = _HAVOK_MAT[bhkshape.material]
 
         return [ b_obj ]
 
@@ -335,13 +460,10 @@ class bhkshape_import():
         b_obj = mesh_from_data("poly", verts, faces)
         
         # set bounds type
-        b_obj.draw_type = 'WIRE'
-        b_obj.draw_bounds_type = 'BOX'
-        b_obj.game.use_collision_bounds = True
-        b_obj.game.collision_bounds_type = 'TRIANGLE_MESH'
+        _apply_props(b_obj, _TRIANGLE_MESH_PROPS)
         # radius: quick estimate
         b_obj.game.radius = bhkshape.radius
-        b_obj.nifcollision.havok_material = NifFormat.HavokMaterial._enumkeys[self.havok_mat]
+        b_obj.nifcollision.havok_material = _HAVOK_MAT[self.havok_mat]
 
         return [ b_obj ]
 
@@ -349,32 +471,43 @@ class bhkshape_import():
         """Import a BhkPackedNiTriStrips block as a Triangle-Mesh collision object"""
 
         # create mesh for each sub shape
-        hk_objects = []
-        vertex_offset = 0
         subshapes = bhkshape.sub_shapes
 
         if not subshapes:
             # fallout 3 stores them in the data
             subshapes = bhkshape.data.sub_shapes
+        hk_objects = [None] * len(subshapes)
+
+        # scale all vertices at once, the sub shapes take consecutive slices
+        havok_scale = self.HAVOK_SCALE
+        all_verts = [ (n_vert.x * havok_scale,
+                       n_vert.y * havok_scale,
+                       n_vert.z * havok_scale)
+                      for n_vert in bhkshape.data.vertices ]
+
+        # sort the triangles into their sub shapes in a single pass,
+        # by the vertex range their first vertex falls into
+        subshape_offsets = []
+        vertex_end = 0
+        for subshape in subshapes:
+            subshape_offsets.append(vertex_end)
+            vertex_end += subshape.num_vertices
+        subshape_faces = [[] for subshape in subshapes]
+        for hktriangle in bhkshape.data.triangles:
+            n_triangle = hktriangle.triangle
+            v_1 = n_triangle.v_1
+            if not 0 <= v_1 < vertex_end:
+                continue
+            subshape_index = bisect_right(subshape_offsets, v_1) - 1
+            offset = subshape_offsets[subshape_index]
+            subshape_faces[subshape_index].append((v_1 - offset,
+                                                   n_triangle.v_2 - offset,
+                                                   n_triangle.v_3 - offset))
 
         for subshape_num, subshape in enumerate(subshapes):
-            verts = []
-            faces = []
-            for vert_index in range(vertex_offset, vertex_offset + subshape.num_vertices):
-                n_vert = bhkshape.data.vertices[vert_index]
-                verts.append( (n_vert.x * self.HAVOK_SCALE,
-                               n_vert.y * self.HAVOK_SCALE,
-                               n_vert.z * self.HAVOK_SCALE) )
-
-            for hktriangle in bhkshape.data.triangles:
-                if ((vertex_offset <= hktriangle.triangle.v_1)
-                    and (hktriangle.triangle.v_1
-                         < vertex_offset + subshape.num_vertices)):
-                    faces.append((hktriangle.triangle.v_1 - vertex_offset,
-                                  hktriangle.triangle.v_2 - vertex_offset,
-                                  hktriangle.triangle.v_3 - vertex_offset) )
-                else:
-                    continue
+            vertex_offset = subshape_offsets[subshape_num]
+            verts = all_verts[vertex_offset:vertex_offset + subshape.num_vertices]
+            faces = subshape_faces[subshape_num]
             # todo: face normals are ignored here - are they even relevant?
             # could just run the recalc normals operator if they are
             # old solution was rather hacky anyway
@@ -382,17 +515,13 @@ class bhkshape_import():
             b_obj = mesh_from_data('poly%i' % subshape_num, verts, faces)
 
             # set bounds type
-            b_obj.draw_type = 'WIRE'
-            b_obj.draw_bounds_type = 'BOX'
-            b_obj.game.use_collision_bounds = True
-            b_obj.game.collision_bounds_type = 'TRIANGLE_MESH'
+            _apply_props(b_obj, _TRIANGLE_MESH_PROPS)
             # radius: quick estimate
-            b_obj.game.radius = min(vert.co.length for vert in b_mesh.vertices)
+            b_obj.game.radius = math.sqrt(min((x * x + y * y + z * z for x, y, z in verts), default=0.0))
             # set material
-            b_obj.nifcollision.havok_material = NifFormat.HavokMaterial._enumkeys[subshape.material]
+            b_obj.nifcollision.havok_material = _HAVOK_MAT[subshape.material]
 
-            vertex_offset += subshape.num_vertices
-            hk_objects.append(b_obj)
+            hk_objects[subshape_num] = b_obj
 
         return hk_objects
 
@@ -448,11 +577,7 @@ class bound_import():
         b_obj.location = n_bbox_center
 
         # set bounds type
-        b_obj.show_bounds = True
-        b_obj.draw_type = 'BOUNDS'
-        b_obj.draw_bounds_type = 'BOX'
-        b_obj.game.use_collision_bounds = True
-        b_obj.game.collision_bounds_type = 'BOX'
+        _apply_props(b_obj, _BOUNDING_BOX_PROPS)
         # quick radius estimate
         b_obj.game.radius = max(maxx, maxy, maxz)
         
@@ -91,6 +91,7 @@ class NifImport(NifCommon):
 
         self.dict_havok_objects = {}
         self.dict_names = {}
+        self.dict_decoded_names = {}
         self.dict_blocks = {}
         self.dict_block_names = []
         self.dict_materials = {}
@@ -113,6 +114,7 @@ class NifImport(NifCommon):
             armature.set_bone_orientation(NifOp.props.axis_forward, NifOp.props.axis_up)
 
             self.data = NifFile.load_nif(NifOp.props.filepath)
+            self.bhkhelper.set_havok_scale(self.data)
             if NifOp.props.override_scene_info:
                 scene_import.import_version_info(self.data)
 
@@ -338,7 +340,7 @@ class NifImport(NifCommon):
             # (NifOp.props.skeleton ==  "SKELETON_ONLY")
             NifLog.debug("Building mesh in import_branch")
             # note: transform matrix is set during import
-            self.active_obj_name = niBlock.name.decode()
+            self.active_obj_name = self.decoded_name(niBlock)
             b_obj = self.import_mesh(niBlock)
             b_obj.niftools.objectflags = niBlock.flags
 
@@ -423,7 +425,7 @@ class NifImport(NifCommon):
                     NifLog.info("Joining geometries {0} to single object '{1}'".format([child.name for child in geom_group], niBlock.name))
                     b_obj = None
                     for child in geom_group:
-                        self.active_obj_name = niBlock.name.decode()
+                        self.active_obj_name = self.decoded_name(niBlock)
                         b_obj = self.import_mesh(child, group_mesh=b_obj, applytransform=True)
                         b_obj.niftools.objectflags = child.flags
 
@@ -617,6 +619,17 @@ class NifImport(NifCommon):
             if b_prop.shader_flags_2._items[sf_index]._value == 1:
                 b_obj.niftools_shader[b_flag_name_2] = True
         
+    def decoded_name(self, niBlock):
+        """Get the decoded nif name of a block, decoding it only once per import.
+
+        :param niBlock: A named nif block.
+        :type niBlock: :class:`~pyffi.formats.nif.NifFormat.NiObjectNET`
+        """
+        name = self.dict_decoded_names.get(id(niBlock))
+        if name is None:
+            name = self.dict_decoded_names[id(niBlock)] = niBlock.name.decode()
+        return name
+
     def import_name(self, niBlock, max_length=63):
         """Get unique name for an object, preserving existing names.
         The maximum name length defaults to 63, since this is the
@@ -637,7 +650,7 @@ class NifImport(NifCommon):
 
         # find unique name for Blender to use
         uniqueInt = 0
-        niName = niBlock.name.decode()
+        niName = self.decoded_name(niBlock)
         # if name is empty, create something non-empty
         if not niName:
             if isinstance(niBlock, NifFormat.RootCollisionNode):
@@ -680,7 +693,7 @@ class NifImport(NifCommon):
         b_empty = bpy.data.objects.new(shortname, None)
 
         # TODO: - is longname needed??? Yes it is needed, it resets the original name on export
-        b_empty.niftools.longname = niBlock.name.decode()
+        b_empty.niftools.longname = self.decoded_name(niBlock)
 
         bpy.context.scene.objects.link(b_empty)
         b_empty.niftools.bsxflags = self.bsxflags
@@ -721,8 +734,8 @@ class NifImport(NifCommon):
             # link mesh object to the scene
             bpy.context.scene.objects.link(b_obj)
             # save original name as object property, for export
-            if b_name != niBlock.name.decode():
-                b_obj.niftools.longname = niBlock.name.decode()
+            if b_name != self.decoded_name(niBlock):
+                b_obj.niftools.longname = self.decoded_name(niBlock)
 
             # Mesh hidden flag
             if niBlock.flags & 1 == 1:
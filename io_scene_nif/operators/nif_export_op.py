@@ -47,12 +47,28 @@ from io_scene_nif.nif_export import EXPORT_SETTINGS_KEY, NifExportSettings
 
 from .nif_common_op import NifOperatorCommon
 
+_GAME_SYMBOLS = ":,'\" +-*!?;./="
+_GAME_TRANS = str.maketrans(_GAME_SYMBOLS, "_" * len(_GAME_SYMBOLS))
+
 def _game_to_enum(game):
-    symbols = ":,'\" +-*!?;./="
-    table = str.maketrans(symbols, "_" * len(symbols))
-    enum = game.upper().translate(table).replace("__", "_")
+    enum = game.upper().translate(_GAME_TRANS).replace("__", "_")
     return enum
 
+def _game_enum_items():
+    """Returns the game enum items and the map of game enum to nif version,
+    in a single pass over the games."""
+    items = []
+    versions = {}
+    # implementation note: reversed makes it show alphabetically
+    # (at least with the current blender)
+    for game in reversed(sorted(x for x in NifFormat.games if x != '?')):
+        enum = _game_to_enum(game)
+        items.append((enum, game, "Export for " + game))
+        versions[enum] = NifFormat.games[game][-1]
+    return tuple(items), versions
+
+_GAME_ITEMS, _GAME_VERSIONS = _game_enum_items()
+
 class NifResetExportSettings(bpy.types.Operator):
     bl_label = "Reset Settings to Defaults"
     bl_idname = "scene.reset_nif_export_settings"
@@ -95,13 +111,7 @@ class NifExportOperator(bpy.types.Operator, ExportHelper, NifOperatorCommon):
 
     #: For which game to export.
     game = bpy.props.EnumProperty(
-        items=[
-            (_game_to_enum(game), game, "Export for " + game)
-            # implementation note: reversed makes it show alphabetically
-            # (at least with the current blender)
-            for game in reversed(sorted(
-                [x for x in NifFormat.games.keys() if x != '?']))
-            ],
+        items=_GAME_ITEMS,
         name="Game",
         description="For which game to export.",
         default='OBLIVION')
@@ -182,10 +192,7 @@ class NifExportOperator(bpy.types.Operator, ExportHelper, NifOperatorCommon):
         default=True)
 
     #: Map game enum to nif version.
-    version = {
-        _game_to_enum(game): versions[-1]
-        for game, versions in NifFormat.games.items() if game != '?'
-        }
+    version = _GAME_VERSIONS
 
     prop_defs = {}
 
@@ -249,14 +256,20 @@ class NifExportOperator(bpy.types.Operator, ExportHelper, NifOperatorCommon):
         return nif_export.NifExport(self, context).execute()
 
 
-def get_export_properties():
+def _find_export_properties():
     prop_defs = {}
 
-    props = vars(NifExportOperator)
-    for k in props:
-        prop = props[k]
-        if type(prop).__name__ == 'tuple':
+    # bpy.props functions return (function, keywords) tuples for the class to register
+    prop_funcs = {getattr(bpy.props, name) for name in dir(bpy.props) if name.endswith("Property")}
+    for k, prop in vars(NifExportOperator).items():
+        if isinstance(prop, tuple) and len(prop) == 2:
             ty, pdict = prop
-            if ty.__name__.find("Property") != -1:
+            if ty in prop_funcs:
                 prop_defs[k] = pdict
-    return prop_defs
\ No newline at end of file
+    return prop_defs
+
+# the properties of the operator class never change, so find them only once
+_EXPORT_PROP_DEFS = _find_export_properties()
+
+def get_export_properties():
+    return _EXPORT_PROP_DEFS
\ No newline at end of file
@@ -56,4 +56,4 @@ class NifOp:
         NifOp.props = operator.properties
         
         # init loggers logging level
-        NifLog.op = operator
+        NifLog.init(operator)
@@ -39,6 +39,9 @@
 
 import logging
 
+# logger whose level, set from the operator, decides if debug messages are reported
+_niftools_logger = logging.getLogger("niftools")
+
 
 class _MockOperator:
     def report(self, level, message):
@@ -52,22 +55,24 @@ class NifLog:
     op = _MockOperator()
 
     @staticmethod
-    def debug(message):
-        """Report a debug message."""
-        NifLog.op.report({'DEBUG'}, message)
+    def debug(message, *args):
+        """Report a debug message. The message is only formatted with args,
+        printf-style, if the log level shows debug messages."""
+        if _niftools_logger.isEnabledFor(logging.DEBUG):
+            NifLog.op.report({'DEBUG'}, message % args if args else message)
 
     @staticmethod
-    def info(message):
-        """Report an informative message."""
-        NifLog.op.report({'INFO'}, message)
+    def info(message, *args):
+        """Report an informative message, formatted printf-style with args."""
+        NifLog.op.report({'INFO'}, message % args if args else message)
 
     @staticmethod
-    def warn(message):
-        """Report a warning message."""
-        NifLog.op.report({'WARNING'}, message)
+    def warn(message, *args):
+        """Report a warning message, formatted printf-style with args."""
+        NifLog.op.report({'WARNING'}, message % args if args else message)
 
     @staticmethod
-    def error(message):
+    def error(message, *args):
         """Report an error and return ``{'FINISHED'}``. To be called by
         the :meth:`execute` method, as::
 
@@ -79,12 +84,12 @@ class NifLog:
 
             The :ref:`error reporting <dev-design-error-reporting>` design.
         """
-        NifLog.op.report({'ERROR'}, message)
+        NifLog.op.report({'ERROR'}, message % args if args else message)
         return {'FINISHED'}
     
     @staticmethod
     def init(operator):
         NifLog.op = operator
         log_level_num = getattr(logging, operator.properties.log_level)
-        logging.getLogger("niftools").setLevel(log_level_num)
+        _niftools_logger.setLevel(log_level_num)
         logging.getLogger("pyffi").setLevel(log_level_num)
@@ -0,0 +1,73 @@
+"""Helper functions to create and check bhkPackedNiTriStripsShape based collisions"""
+
+# ***** BEGIN LICENSE BLOCK *****
+#
+# Copyright © 2005-2015, NIF File Format Library and Tools contributors.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above
+#      copyright notice, this list of conditions and the following
+#      disclaimer in the documentation and/or other materials provided
+#      with the distribution.
+#
+#    * Neither the name of the NIF File Format Library and Tools
+#      project nor the names of its contributors may be used to endorse
+#      or promote products derived from this software without specific
+#      prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+# ***** END LICENSE BLOCK *****
+
+import nose
+
+from pyffi.formats.nif import NifFormat
+
+# a tetrahedron, in nif units once add_shape has divided them by 7,
+# whose vertex closest to the origin is at distance 1
+TETRA_VERTICES = [(7, 0, 0), (14, 0, 0), (7, 7, 0), (7, 0, 7)]
+TETRA_TRIANGLES = [(0, 2, 1), (0, 1, 3), (0, 3, 2), (1, 2, 3)]
+TETRA_NORMALS = [(0, 0, -1), (0, -1, 0), (-1, 0, 0), (1, 1, 1)]
+
+def n_attach_bhkpackednitristripsshape(n_bhkrigidbody):
+    """Attaches a bhkPackedNiTriStripsShape with a tetrahedron sub shape
+    followed by an empty sub shape."""
+
+    n_bhkpackednitristripsshape = NifFormat.bhkPackedNiTriStripsShape()
+    n_bhkrigidbody.shape = n_bhkpackednitristripsshape
+
+    n_bhkpackednitristripsshape.add_shape(TETRA_TRIANGLES, TETRA_NORMALS, TETRA_VERTICES,
+                                          layer=NifFormat.OblivionLayer.OL_STATIC,
+                                          material=NifFormat.HavokMaterial.HAV_MAT_STONE)
+    n_bhkpackednitristripsshape.add_shape([], [], [],
+                                          layer=NifFormat.OblivionLayer.OL_STATIC,
+                                          material=NifFormat.HavokMaterial.HAV_MAT_WOOD)
+    return n_bhkpackednitristripsshape
+
+
+def n_check_bhkpackednitristripsshape_data(n_bhkrigidbody):
+    nose.tools.assert_equal(n_bhkrigidbody.shape != None, True)
+    n_bhkpackednitristripsshape = n_bhkrigidbody.shape
+    nose.tools.assert_is_instance(n_bhkpackednitristripsshape, NifFormat.bhkPackedNiTriStripsShape)
+    nose.tools.assert_equal(n_bhkpackednitristripsshape.num_sub_shapes, 2)
+    nose.tools.assert_equal(n_bhkpackednitristripsshape.sub_shapes[0].num_vertices, len(TETRA_VERTICES))
+    nose.tools.assert_equal(n_bhkpackednitristripsshape.sub_shapes[1].num_vertices, 0)
+    return n_bhkpackednitristripsshape
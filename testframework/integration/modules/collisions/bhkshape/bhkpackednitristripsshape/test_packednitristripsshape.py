@@ -0,0 +1,123 @@
+"""Import packed tristrips collisions, including an empty sub shape."""
+
+# ***** BEGIN LICENSE BLOCK *****
+#
+# Copyright © 2005-2015, NIF File Format Library and Tools contributors.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#
+#    * Redistributions in binary form must reproduce the above
+#      copyright notice, this list of conditions and the following
+#      disclaimer in the documentation and/or other materials provided
+#      with the distribution.
+#
+#    * Neither the name of the NIF File Format Library and Tools
+#      project nor the names of its contributors may be used to endorse
+#      or promote products derived from this software without specific
+#      prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+# ***** END LICENSE BLOCK *****
+
+import math
+import os
+import os.path
+
+import bpy
+import nose.tools
+
+from pyffi.formats.nif import NifFormat
+
+from io_scene_nif.nif_common import NifCommon
+
+from integration import Base
+from integration.data import n_gen_header
+from integration.modules.geometry.trishape import n_gen_geometry
+from integration.modules.collisions.bhkshape import n_gen_collision
+from integration.modules.collisions.bhkshape.bhkpackednitristripsshape import n_gen_bhkpackednitristripsshape
+
+class TestCollisionBhkPackedNiTriStripsShape(Base):
+    """Import a bhkPackedNiTriStripsShape, one object is created per sub shape."""
+
+    n_name = 'collisions/bhkpackednitristripsshape/test_packednitristripsshape'
+    b_col_names = ('poly0', 'poly1')
+
+    EPSILON = 0.005
+    """A small value used when comparing floats."""
+
+    def __init__(self):
+        """Initialize the test."""
+        Base.__init__(self)
+        self.n_data = NifFormat.Data()
+
+        nif_path = "integration/gen/nif/" + self.n_name
+        self.n_filepath_0 = nif_path + "_py_code.nif"
+        if not os.path.exists(nif_path):
+            os.makedirs(nif_path)
+
+    def n_create_data(self):
+        n_gen_header.n_create_header_oblivion(self.n_data)
+        n_gen_geometry.n_create_blocks(self.n_data)
+
+        n_ninode = self.n_data.roots[0]
+        n_gen_collision.n_attach_bsx_flag(n_ninode)
+
+        #generate common collision tree
+        n_bhkcolobj = n_gen_collision.n_attach_bhkcollisionobject(n_ninode)
+        n_bhkrigidbody = n_gen_collision.n_attach_bhkrigidbody(n_bhkcolobj)
+
+        #generate bhkpackednitristripsshape specific data
+        n_gen_bhkpackednitristripsshape.n_attach_bhkpackednitristripsshape(n_bhkrigidbody)
+
+        return self.n_data
+
+    def test_import_pycode(self):
+        """PyCode : Import python generated packed tristrips"""
+        self.n_create_data()
+        with open(self.n_filepath_0, "wb") as stream:
+            self.n_data.write(stream)
+
+        n_bhkcollisionobject = n_gen_collision.n_check_bhkcollisionobject_data(self.n_data.roots[0])
+        n_bhkrigidbody = n_gen_collision.n_check_bhkrigidbody_data(n_bhkcollisionobject)
+        n_shape = n_gen_bhkpackednitristripsshape.n_check_bhkpackednitristripsshape_data(n_bhkrigidbody)
+
+        self.b_clear()
+        bpy.ops.import_scene.nif(
+            filepath=self.n_filepath_0,
+            log_level='DEBUG',
+            )
+
+        for b_col_name in self.b_col_names:
+            nose.tools.assert_true(b_col_name in bpy.data.objects)
+
+        # the radius is the distance of the vertex closest to the origin
+        n_radius = min(math.sqrt(n_vert.x ** 2 + n_vert.y ** 2 + n_vert.z ** 2)
+                       for n_vert in n_shape.data.vertices)
+        b_tetra_obj = bpy.data.objects[self.b_col_names[0]]
+        nose.tools.assert_equal(len(b_tetra_obj.data.vertices), 4)
+        nose.tools.assert_equal(len(b_tetra_obj.data.polygons), 4)
+        nose.tools.assert_true(abs(b_tetra_obj.game.radius - n_radius * NifCommon.HAVOK_SCALE) < self.EPSILON)
+
+        # an empty sub shape gives radius 0, which blender clamps to its minimum
+        b_empty_obj = bpy.data.objects[self.b_col_names[1]]
+        nose.tools.assert_equal(len(b_empty_obj.data.vertices), 0)
+        b_radius_min = b_empty_obj.game.bl_rna.properties['radius'].hard_min
+        nose.tools.assert_true(abs(b_empty_obj.game.radius - max(0.0, b_radius_min)) < self.EPSILON)